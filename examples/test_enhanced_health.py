@@ -8,87 +8,113 @@ import httpx
 from datetime import datetime
 import pytz
 
+# Shared client so repeated demo/monitoring calls reuse the same keep-alive
+# connection instead of redoing the TCP handshake per request.
+_client: httpx.AsyncClient = None
+
+# Built once at import; rebuilding these per poll just churns allocations
+STATUS_INDICATORS = {
+    'fresh': '✅ FRESH - Data is very recent',
+    'acceptable': '⚠️  ACCEPTABLE - Within daily update cycle',
+    'stale': '❌ STALE - Data is old, check fetching process',
+    'unknown': '❓ UNKNOWN - No data status available'
+}
+
+RECOMMENDATIONS = {
+    'fresh': ["💡 Recommendation: System is working optimally!"],
+    'acceptable': ["💡 Recommendation: System is functioning normally."],
+    'stale': [
+        "💡 Recommendation: Check the daily fetching process and logs.",
+        "   - Verify Andel Energi API connectivity",
+        "   - Check scheduler configuration",
+        "   - Review application logs for errors",
+    ],
+}
+
+DEFAULT_RECOMMENDATION = ["💡 Recommendation: Check if any data has been fetched."]
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Get (lazily creating) the shared HTTP client."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30)
+        )
+    return _client
+
+
+async def _close_client() -> None:
+    """Close the shared HTTP client if it was created."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 async def demo_health_endpoint():
     """Demonstrate the enhanced health endpoint features."""
     print("🏥 Enhanced Health Endpoint Demo")
     print("=" * 50)
-    
+
     # Test the health endpoint
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get("http://localhost:8000/api/v1/health")
-            response.raise_for_status()
-            
-            health_data = response.json()
-            
-            # Display the basic response
-            print("📊 Health Response:")
-            print(f"  Status: {health_data['status']}")
-            print(f"  Timestamp: {health_data['timestamp']}")
-            print()
-            
-            # Parse the enhanced details
-            details = health_data.get('details', {})
-            
-            print("🔍 Enhanced Details:")
-            print(f"  Service: {details.get('service')}")
-            print()
-            
-            # Data freshness analysis
-            last_fetch = details.get('last_fetch')
-            last_fetch_utc = details.get('last_fetch_utc')
-            data_age_hours = details.get('data_age_hours')
-            data_status = details.get('data_status')
-            
-            if last_fetch:
-                print("📅 Data Freshness Analysis:")
-                print(f"  Last Fetch (Copenhagen): {last_fetch}")
-                print(f"  Last Fetch (UTC): {last_fetch_utc}")
-                print(f"  Data Age: {data_age_hours} hours")
-                
-                # Visual status indicator
-                status_indicators = {
-                    'fresh': '✅ FRESH - Data is very recent',
-                    'acceptable': '⚠️  ACCEPTABLE - Within daily update cycle', 
-                    'stale': '❌ STALE - Data is old, check fetching process',
-                    'unknown': '❓ UNKNOWN - No data status available'
-                }
-                
-                print(f"  Data Status: {status_indicators.get(data_status, data_status)}")
-                print()
-                
-                # Recommendations based on data status
-                if data_status == 'fresh':
-                    print("💡 Recommendation: System is working optimally!")
-                elif data_status == 'acceptable':
-                    print("💡 Recommendation: System is functioning normally.")
-                elif data_status == 'stale':
-                    print("💡 Recommendation: Check the daily fetching process and logs.")
-                    print("   - Verify Andel Energi API connectivity")
-                    print("   - Check scheduler configuration")
-                    print("   - Review application logs for errors")
-                else:
-                    print("💡 Recommendation: Check if any data has been fetched.")
-            else:
-                print("❌ No data fetch information available")
-                print("💡 Recommendation: Initialize the system with data fetch")
+    client = _get_client()
+    try:
+        response = await client.get("http://localhost:8000/api/v1/health")
+        response.raise_for_status()
+        
+        health_data = response.json()
+        
+        # Display the basic response
+        print("📊 Health Response:")
+        print(f"  Status: {health_data['status']}")
+        print(f"  Timestamp: {health_data['timestamp']}")
+        print()
+        
+        # Parse the enhanced details
+        details = health_data.get('details', {})
+        
+        print("🔍 Enhanced Details:")
+        print(f"  Service: {details.get('service')}")
+        print()
+        
+        # Data freshness analysis
+        last_fetch = details.get('last_fetch')
+        last_fetch_utc = details.get('last_fetch_utc')
+        data_age_hours = details.get('data_age_hours')
+        data_status = details.get('data_status')
+        
+        if last_fetch:
+            print("📅 Data Freshness Analysis:")
+            print(f"  Last Fetch (Copenhagen): {last_fetch}")
+            print(f"  Last Fetch (UTC): {last_fetch_utc}")
+            print(f"  Data Age: {data_age_hours} hours")
             
+            print(f"  Data Status: {STATUS_INDICATORS.get(data_status, data_status)}")
             print()
-            print("🔧 Timezone Handling:")
-            print("  • last_fetch: Converted to Copenhagen time for readability")
-            print("  • last_fetch_utc: Raw database timestamp (UTC)")
-            print("  • Helps monitor if daily 14:10 CET fetch is working")
-            
-            return health_data
-            
-        except httpx.ConnectError:
-            print("❌ Connection Error: API server is not running")
-            print("💡 Start the server with: python -m src.main")
-            return None
-        except httpx.RequestError as e:
-            print(f"❌ Request Error: {e}")
-            return None
+
+            # Recommendations based on data status
+            for line in RECOMMENDATIONS.get(data_status, DEFAULT_RECOMMENDATION):
+                print(line)
+        else:
+            print("❌ No data fetch information available")
+            print("💡 Recommendation: Initialize the system with data fetch")
+        
+        print()
+        print("🔧 Timezone Handling:")
+        print("  • last_fetch: Converted to Copenhagen time for readability")
+        print("  • last_fetch_utc: Raw database timestamp (UTC)")
+        print("  • Helps monitor if daily 14:10 CET fetch is working")
+        
+        return health_data
+        
+    except httpx.ConnectError:
+        print("❌ Connection Error: API server is not running")
+        print("💡 Start the server with: python -m src.main")
+        return None
+    except httpx.RequestError as e:
+        print(f"❌ Request Error: {e}")
+        return None
 
 
 async def compare_with_basic_health():
@@ -135,7 +161,8 @@ if __name__ == "__main__":
     async def main():
         await demo_health_endpoint()
         await compare_with_basic_health()
-        
+        await _close_client()
+
         print("\n✨ Demo completed!")
         print("\nNext Steps:")
         print("  1. Integrate with monitoring systems")
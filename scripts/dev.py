@@ -37,28 +37,32 @@ async def fetch_prices_manual():
     print("Manual price fetch completed")
 
 
-async def show_recent_prices():
-    """Display recent price data from the database."""
-    print("Fetching recent price data...")
-    setup_logging()
-    
-    records = await db_service.get_recent_records(hours=48)
-    
+def _print_recent_prices(records):
+    """Print a table of recent price records."""
     if not records:
         print("No price data found in database")
         return
-    
+
     print(f"\nFound {len(records)} recent price records:")
     print("-" * 80)
     print(f"{'Timestamp':<20} {'Spot Price':<12} {'Transport':<12} {'Total':<12} {'Category':<12}")
     print("-" * 80)
-    
+
     for record in records:
         print(f"{record.timestamp.strftime('%Y-%m-%d %H:%M'):<20} "
               f"{record.spot_price:>8.3f} DKK {record.transport_taxes:>8.3f} DKK "
               f"{record.total_price:>8.3f} DKK {record.category.value:<12}")
 
 
+async def show_recent_prices():
+    """Display recent price data from the database."""
+    print("Fetching recent price data...")
+    setup_logging()
+
+    records = await db_service.get_recent_records(hours=48)
+    _print_recent_prices(records)
+
+
 async def test_optimization():
     """Test price optimization algorithms with current data."""
     print("Testing price optimization...")
@@ -81,6 +85,81 @@ async def test_optimization():
         print(f"   Error: {e}")
 
 
+def _print_stats(stats):
+    """Print the price data statistics report."""
+    if not stats['total_records']:
+        print("No price data found in database")
+        return
+
+    print("\nPrice Data Statistics:")
+    print("-" * 40)
+    print(f"Total records: {stats['total_records']}")
+    print(f"First timestamp: {stats['first_timestamp']}")
+    print(f"Last timestamp: {stats['last_timestamp']}")
+    print(f"Min price: {stats['min_price']:.4f} DKK/kWh")
+    print(f"Max price: {stats['max_price']:.4f} DKK/kWh")
+    print(f"Avg price: {stats['avg_price']:.4f} DKK/kWh")
+    print(f"Records in last 24h: {stats['last_24h_records']}")
+    print("\nRecords per category:")
+    for category, count in stats['categories'].items():
+        print(f"  {category:<8} {count}")
+
+
+async def show_stats():
+    """Display summary statistics for stored price data."""
+    print("Fetching price data statistics...")
+    setup_logging()
+
+    stats = await db_service.get_price_stats()
+    _print_stats(stats)
+
+
+async def check_gaps():
+    """Check for missing hourly records in the recent price data."""
+    print("Checking for gaps in recent price data...")
+    setup_logging()
+
+    from datetime import timedelta
+    end_time = datetime.now().replace(minute=0, second=0, microsecond=0)
+    start_time = end_time - timedelta(hours=48)
+
+    missing = await db_service.find_missing_hours(start_time, end_time)
+    _print_gaps(missing)
+
+
+def _print_gaps(missing):
+    """Print the gap check report."""
+    if not missing:
+        print("No gaps found in the last 48 hours")
+        return
+
+    print(f"\nFound {len(missing)} missing hours:")
+    for timestamp in missing:
+        print(f"  {timestamp.strftime('%Y-%m-%d %H:%M')}")
+
+
+async def run_all_checks():
+    """Run all inspection reports, fetching their data concurrently."""
+    print("Running all database checks...")
+    setup_logging()
+
+    from datetime import timedelta
+    end_time = datetime.now().replace(minute=0, second=0, microsecond=0)
+    start_time = end_time - timedelta(hours=48)
+
+    # All three reports are read-only; overlap their queries so the wall
+    # time is the slowest query instead of the sum of all of them
+    stats, records, missing = await asyncio.gather(
+        db_service.get_price_stats(),
+        db_service.get_recent_records(hours=48),
+        db_service.find_missing_hours(start_time, end_time),
+    )
+
+    _print_stats(stats)
+    _print_recent_prices(records)
+    _print_gaps(missing)
+
+
 async def cleanup_old_data():
     """Clean up old price data based on retention settings."""
     print(f"Cleaning up data older than {settings.data_retention_days} days...")
@@ -137,6 +216,9 @@ def main():
         print("  fetch-prices      - Manually fetch price data")
         print("  show-prices       - Display recent price data")
         print("  test-optimization - Test price optimization algorithms")
+        print("  show-stats        - Display price data statistics")
+        print("  check-gaps        - Check for missing hourly price records")
+        print("  check-all         - Run all inspection reports")
         print("  cleanup-data      - Clean up old price data")
         print("  show-config       - Display current configuration")
         print("  test-api          - Test Andel Energi API connection")
@@ -152,6 +234,12 @@ def main():
         asyncio.run(show_recent_prices())
     elif command == "test-optimization":
         asyncio.run(test_optimization())
+    elif command == "show-stats":
+        asyncio.run(show_stats())
+    elif command == "check-gaps":
+        asyncio.run(check_gaps())
+    elif command == "check-all":
+        asyncio.run(run_all_checks())
     elif command == "cleanup-data":
         asyncio.run(cleanup_old_data())
     elif command == "show-config":
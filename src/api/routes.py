@@ -3,10 +3,13 @@ FastAPI route handlers for the main API endpoints.
 Implements the two core endpoints specified in the PRD.
 """
 
-from datetime import datetime
-from typing import Optional
+import hashlib
+import time
+from datetime import datetime, timezone
+from typing import Literal, Optional
+from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
 from src.database.service import db_service
 from src.exceptions import NoPriceDataError, NoSequenceFoundError, PriceAPIException
@@ -16,8 +19,49 @@ from src.services.price_service import price_service
 
 logger = get_logger(__name__)
 
+# Bound once at import so the error branches skip the per-call bind()
+# allocation; the endpoint name never changes per handler
+_hour_logger = logger.bind(endpoint="cheapest-hour")
+_sequence_logger = logger.bind(endpoint="cheapest-sequence-start")
+
 router = APIRouter()
 
+# Resolved once at import; zoneinfo conversions run in C without pytz's
+# Python-level transition search
+_COPENHAGEN_TZ = ZoneInfo('Europe/Copenhagen')
+_UTC = timezone.utc
+
+# time_until has minute resolution, so responses are valid for up to a minute
+# and clients/CDNs can revalidate with If-None-Match
+_CACHE_MAX_AGE_SECONDS = 60
+
+
+def _optimal_time_etag(result: OptimalTimeResponse) -> str:
+    """Build a strong ETag from the response content."""
+    digest = hashlib.blake2b(
+        f"{result.start_time.isoformat()}|{result.time_until}".encode(),
+        digest_size=8,
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+# Load balancers poll /health many times a minute, but the latest-fetch
+# timestamp changes at most once per fetch cycle — cache it briefly.
+_HEALTH_STATS_TTL_SECONDS = 30.0
+_health_stats_cache = {"checked_at": 0.0, "value": None}
+
+
+async def _get_health_stats_cached() -> dict:
+    """Get data-freshness stats, cached for a short TTL."""
+    now = time.monotonic()
+    if now - _health_stats_cache["checked_at"] < _HEALTH_STATS_TTL_SECONDS:
+        return _health_stats_cache["value"]
+
+    value = await db_service.get_health_stats()
+    _health_stats_cache["checked_at"] = now
+    _health_stats_cache["value"] = value
+    return value
+
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
@@ -28,42 +72,30 @@ async def health_check():
     The last_fetch timestamp shows when the most recent price data was inserted
     into the database, helping monitor if the daily data fetching is working properly.
     """
+    # One clock read per probe, shared by the success and failure paths
+    now = datetime.now()
+
     try:
-        # Get the latest record timestamp to check data freshness
-        last_fetch = await db_service.get_latest_record_timestamp()
-        
+        # Age and freshness classification are computed in SQL; only the
+        # Copenhagen display conversion happens here
+        stats = await _get_health_stats_cached()
+        last_fetch = stats['last_fetch']
+        data_age_hours = stats['data_age_hours']
+        data_status = stats['data_status']
+
         # Convert to Copenhagen time if available
         last_fetch_copenhagen = None
         if last_fetch:
             # PostgreSQL typically stores CURRENT_TIMESTAMP as UTC
             # Convert to Copenhagen time for better readability
-            import pytz
-            copenhagen_tz = pytz.timezone('Europe/Copenhagen')
-            
+
             # If timestamp is timezone-naive, assume it's UTC
             if last_fetch.tzinfo is None:
-                last_fetch_utc = last_fetch.replace(tzinfo=pytz.UTC)
-            else:
-                last_fetch_utc = last_fetch.astimezone(pytz.UTC)
-            
-            last_fetch_copenhagen = last_fetch_utc.astimezone(copenhagen_tz)
-        
-        # Calculate data freshness
-        data_age_hours = None
-        data_status = "unknown"
-        
-        if last_fetch_copenhagen:
-            now_copenhagen = datetime.now(copenhagen_tz)
-            data_age = now_copenhagen - last_fetch_copenhagen
-            data_age_hours = round(data_age.total_seconds() / 3600, 1)
-            
-            # Classify data freshness
-            if data_age_hours <= 3:
-                data_status = "fresh"  # Very recent
-            elif data_age_hours <= 25:
-                data_status = "acceptable"  # Within daily update cycle
+                last_fetch_utc = last_fetch.replace(tzinfo=_UTC)
             else:
-                data_status = "stale"  # More than a day old
+                last_fetch_utc = last_fetch.astimezone(_UTC)
+
+            last_fetch_copenhagen = last_fetch_utc.astimezone(_COPENHAGEN_TZ)
         
         details = {
             "service": "energy-price-api",
@@ -75,7 +107,7 @@ async def health_check():
         
         return HealthResponse(
             status="healthy",
-            timestamp=datetime.now(),
+            timestamp=now,
             details=details
         )
         
@@ -83,23 +115,24 @@ async def health_check():
         logger.error("Health check failed", error=str(e))
         return HealthResponse(
             status="unhealthy",
-            timestamp=datetime.now(),
+            timestamp=now,
             details={"service": "energy-price-api", "error": str(e)}
         )
 
 
 @router.get("/cheapest-hour", response_model=OptimalTimeResponse)
 async def get_cheapest_hour(
+    request: Request,
+    response: Response,
     within_hours: Optional[int] = Query(
         default=None,
         description="Look ahead window in hours. If not specified, uses all available predictions.",
         ge=1,
         le=168  # Max 1 week ahead
     ),
-    format: str = Query(
+    format: Literal["hours", "minutes"] = Query(
         default="hours",
         description="Time format: 'hours' for HH:MM format, 'minutes' for integer minutes",
-        pattern="^(hours|minutes)$"
     )
 ):
     """
@@ -119,20 +152,37 @@ async def get_cheapest_hour(
     """
     try:
         result = await price_service.get_cheapest_hour(within_hours, format)
+
+        etag = _optimal_time_etag(result)
+        if request.headers.get("if-none-match") == etag:
+            # RFC 7232: the 304 carries the validator too, so caches can
+            # refresh their stored metadata
+            return Response(
+                status_code=304,
+                headers={
+                    "ETag": etag,
+                    "Cache-Control": f"public, max-age={_CACHE_MAX_AGE_SECONDS}",
+                },
+            )
+
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = f"public, max-age={_CACHE_MAX_AGE_SECONDS}"
         return result
         
     except NoPriceDataError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except PriceAPIException as e:
-        logger.error("Price API error", error=str(e), within_hours=within_hours)
+        _hour_logger.error("Price API error", error=str(e), within_hours=within_hours)
         raise HTTPException(status_code=500, detail="Internal server error")
     except Exception as e:
-        logger.error("Unexpected error", error=str(e), within_hours=within_hours)
+        _hour_logger.error("Unexpected error", error=str(e), within_hours=within_hours)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.get("/cheapest-sequence-start", response_model=OptimalTimeResponse)
 async def get_cheapest_sequence_start(
+    request: Request,
+    response: Response,
     duration: int = Query(
         description="Length of sequence in hours (required)",
         ge=1,
@@ -144,10 +194,9 @@ async def get_cheapest_sequence_start(
         ge=1,
         le=168  # Max 1 week ahead
     ),
-    format: str = Query(
+    format: Literal["hours", "minutes"] = Query(
         default="hours",
         description="Time format: 'hours' for HH:MM format, 'minutes' for integer minutes",
-        pattern="^(hours|minutes)$"
     )
 ):
     """
@@ -166,26 +215,40 @@ async def get_cheapest_sequence_start(
     Raises:
         HTTPException: 400 for invalid parameters, 404 if no data available, 500 for server errors.
     """
+    # Pure parameter validation happens before the try block so the 400
+    # doesn't have to be re-raised through the generic handlers below
+    if within_hours is not None and duration > within_hours:
+        raise HTTPException(
+            status_code=400,
+            detail="Duration cannot be longer than the look ahead window"
+        )
+
     try:
-        # Business logic validation
-        if within_hours is not None and duration > within_hours:
-            raise HTTPException(
-                status_code=400,
-                detail="Duration cannot be longer than the look ahead window"
-            )
-        
         result = await price_service.get_cheapest_sequence_start(duration, within_hours, format)
+
+        etag = _optimal_time_etag(result)
+        if request.headers.get("if-none-match") == etag:
+            # RFC 7232: the 304 carries the validator too, so caches can
+            # refresh their stored metadata
+            return Response(
+                status_code=304,
+                headers={
+                    "ETag": etag,
+                    "Cache-Control": f"public, max-age={_CACHE_MAX_AGE_SECONDS}",
+                },
+            )
+
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = f"public, max-age={_CACHE_MAX_AGE_SECONDS}"
         return result
-        
-    except HTTPException:
-        raise
+
     except NoSequenceFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except PriceAPIException as e:
-        logger.error("Price API error", error=str(e), duration=duration, within_hours=within_hours)
+        _sequence_logger.error("Price API error", error=str(e), duration=duration, within_hours=within_hours)
         raise HTTPException(status_code=500, detail="Internal server error")
     except Exception as e:
-        logger.error("Unexpected error", error=str(e), duration=duration, within_hours=within_hours)
+        _sequence_logger.error("Unexpected error", error=str(e), duration=duration, within_hours=within_hours)
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -3,15 +3,23 @@ Application configuration management using Pydantic Settings.
 Handles environment variables and default values for the service.
 """
 
+from functools import lru_cache
+
 from pydantic import Field
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """
     Application settings loaded from environment variables.
     """
-    
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        frozen=True,
+    )
+
     # API Configuration
     api_host: str = Field(default="0.0.0.0", description="API host address")
     api_port: int = Field(default=8000, description="API port")
@@ -24,6 +32,14 @@ class Settings(BaseSettings):
         description="PostgreSQL database connection URL"
     )
     
+    # Database Pool Configuration
+    db_pool_min_size: int = Field(default=2, description="Minimum connections kept in the pool")
+    db_pool_max_size: int = Field(default=10, description="Maximum connections the pool may open")
+    db_pool_max_inactive_lifetime: float = Field(
+        default=300.0,
+        description="Seconds before an idle pool connection is recycled"
+    )
+
     # Andel Energi API Configuration
     andel_energi_base_url: str = Field(
         default="https://andelenergi.dk/",
@@ -51,10 +67,12 @@ class Settings(BaseSettings):
     # Data Retention Configuration
     data_retention_days: int = Field(default=30, description="Days to retain old price data")
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the application settings, parsing the environment only once."""
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -4,11 +4,13 @@ Handles all database operations and migrations in one place.
 """
 
 import asyncio
+from bisect import bisect_left
 from datetime import datetime, timedelta
 from typing import List, Optional
 from urllib.parse import urlparse
 
 import asyncpg
+import numpy as np
 
 from src.config import settings
 from src.exceptions import DatabaseError, NoPriceDataError, NoSequenceFoundError
@@ -18,7 +20,62 @@ from src.utils.time_utils import get_next_complete_hour
 
 logger = get_logger(__name__)
 
-CURRENT_SCHEMA_VERSION = 3
+CURRENT_SCHEMA_VERSION = 8
+
+# Batches at least this large are loaded via COPY into a staging table;
+# below it, COPY's setup cost outweighs executemany's per-row overhead
+COPY_BATCH_THRESHOLD = 200
+
+# Retention deletes run in chunks of this many rows per transaction
+CLEANUP_DELETE_CHUNK = 10_000
+
+# Plain dict lookup instead of PriceCategory(value), which goes through
+# the enum's __call__/_missing_ machinery on every row
+_CATEGORY_BY_VALUE = {category.value: category for category in PriceCategory}
+
+# Integer codes for the columnar read path, in PriceCategory declaration order
+_CATEGORY_CODE_BY_VALUE = {category.value: code for code, category in enumerate(PriceCategory)}
+
+# The sequence query embeds the duration in its frame clause (frame bounds
+# cannot be bound as parameters), so cache the 24 possible SQL strings
+# instead of rebuilding ~1KB of text per request
+_SEQUENCE_QUERY_CACHE = {}
+
+
+def _sequence_query(duration: int) -> str:
+    """Get the cheapest-sequence SQL for a validated duration, cached."""
+    query = _SEQUENCE_QUERY_CACHE.get(duration)
+    if query is None:
+        # A RANGE window over the following duration-1 hours computes each
+        # candidate's sum and completeness in one ordered pass; a gap leaves
+        # sequence_count short, so non-consecutive hours never qualify
+        query = f"""
+            WITH sequence_sums AS (
+                SELECT timestamp, spot_price, transport_taxes, total_price, median_price, category,
+                       SUM(total_price) OVER w AS sequence_sum,
+                       COUNT(*) OVER w AS sequence_count
+                FROM price_records
+                WHERE timestamp >= $1 AND timestamp <= $2
+                WINDOW w AS (
+                    ORDER BY timestamp
+                    RANGE BETWEEN CURRENT ROW AND INTERVAL '{duration-1} hours' FOLLOWING
+                )
+            )
+            SELECT timestamp, spot_price, transport_taxes, total_price, median_price, category
+            FROM sequence_sums
+            WHERE sequence_count = $3
+            ORDER BY sequence_sum ASC, timestamp ASC
+            LIMIT 1
+        """
+        _SEQUENCE_QUERY_CACHE[duration] = query
+    return query
+
+
+# Pre-warm every legal duration at import so no request, not even the first
+# for a given duration, pays the string build
+for _duration in range(1, 25):
+    _sequence_query(_duration)
+del _duration
 
 
 class DatabaseService:
@@ -27,16 +84,57 @@ class DatabaseService:
     def __init__(self, database_url: str = None):
         self.database_url = database_url or settings.database_url
         self._pool = None
+        self._pool_lock = asyncio.Lock()
+        self._initialized = False
+        self._data_version = 0
+
+    @property
+    def data_version(self) -> int:
+        """Counter bumped whenever price data changes; used as a cache key."""
+        return self._data_version
+
+    @staticmethod
+    def _row_to_record(row: asyncpg.Record) -> PriceRecord:
+        """Build a PriceRecord from a price_records row without re-validation."""
+        return PriceRecord.model_construct(
+            timestamp=row['timestamp'],
+            spot_price=row['spot_price'],
+            transport_taxes=row['transport_taxes'],
+            total_price=row['total_price'],
+            median_price=row['median_price'],
+            category=_CATEGORY_BY_VALUE[row['category']],
+        )
     
+    @staticmethod
+    async def _init_connection(conn: asyncpg.Connection) -> None:
+        """Apply session settings once per pooled connection."""
+        # Every query here is a short indexed lookup; JIT compilation would
+        # cost more than the queries themselves. Set once at connection
+        # creation instead of per request.
+        await conn.execute("SET jit = off")
+        await conn.execute("SET statement_timeout = '30s'")
+
     async def _get_pool(self) -> asyncpg.Pool:
         """Get or create connection pool."""
         if self._pool is None or self._pool.is_closing():
-            self._pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=2,
-                max_size=10,
-                command_timeout=60
-            )
+            # Serialize creation: without the lock, concurrent first requests
+            # each build a pool and all but one leak its connections
+            async with self._pool_lock:
+                if self._pool is None or self._pool.is_closing():
+                    self._pool = await asyncpg.create_pool(
+                        self.database_url,
+                        # Sized per deployment: small boxes can shrink the pool while
+                        # busy ones raise it toward their max_connections budget
+                        min_size=settings.db_pool_min_size,
+                        max_size=settings.db_pool_max_size,
+                        max_inactive_connection_lifetime=settings.db_pool_max_inactive_lifetime,
+                        command_timeout=60,
+                        init=self._init_connection,
+                        # asyncpg prepares and caches statements per connection, so
+                        # the hot range queries skip parse/plan after first use; size
+                        # it to comfortably hold every query shape this service runs
+                        statement_cache_size=256,
+                    )
         return self._pool
     
     async def close(self):
@@ -44,38 +142,56 @@ class DatabaseService:
         if self._pool and not self._pool.is_closing():
             await self._pool.close()
     
-    async def init_database(self) -> None:
-        """Initialize database with tables, indexes, and migrations."""
+    async def init_database(self, force: bool = False) -> None:
+        """Initialize database with tables, indexes, and migrations.
+
+        Safe to call repeatedly: after the first successful run it returns
+        immediately unless force=True, so scripts that defensively init
+        before their own work don't re-pay the version check round-trips.
+        """
+        if self._initialized and not force:
+            return
+
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
                 # Check current schema version
                 current_version = await self._get_schema_version(conn)
                 
+                # DDL is transactional in Postgres: run setup/migrations plus
+                # their version stamps atomically, so an interrupted init
+                # can't leave half a schema marked with the old version
                 if current_version == 0:
                     # Initial setup
-                    await self._create_initial_schema(conn)
-                    await self._set_schema_version(conn, CURRENT_SCHEMA_VERSION)
+                    async with conn.transaction():
+                        await self._create_initial_schema(conn)
+                        await self._set_schema_version(conn, CURRENT_SCHEMA_VERSION)
                     logger.info("Database initialized with schema version", version=CURRENT_SCHEMA_VERSION)
                 elif current_version < CURRENT_SCHEMA_VERSION:
                     # Run migrations
-                    await self._run_migrations(conn, current_version)
+                    async with conn.transaction():
+                        await self._run_migrations(conn, current_version)
                     logger.info("Database migrated", from_version=current_version, to_version=CURRENT_SCHEMA_VERSION)
-                    
+
+            self._initialized = True
+
         except Exception as e:
             logger.error("Failed to initialize database", error=str(e))
             raise DatabaseError(f"Database initialization failed: {e}")
     
     async def _get_schema_version(self, conn: asyncpg.Connection) -> int:
         """Get current database schema version."""
-        try:
-            result = await conn.fetchval(
-                "SELECT version FROM schema_version ORDER BY version DESC LIMIT 1"
-            )
-            return result if result else 0
-        except asyncpg.UndefinedTableError:
+        # to_regclass is a syscache lookup, so first-run detection costs a
+        # cheap probe instead of a raised-and-caught UndefinedTableError
+        table_exists = await conn.fetchval(
+            "SELECT to_regclass('schema_version') IS NOT NULL"
+        )
+        if not table_exists:
             # Table doesn't exist, this is a new database
             return 0
+
+        result = await conn.fetchval("SELECT MAX(version) FROM schema_version")
+        return result if result else 0
     
     async def _set_schema_version(self, conn: asyncpg.Connection, version: int) -> None:
         """Set database schema version."""
@@ -109,17 +225,19 @@ class DatabaseService:
             )
         """)
         
-        # Indexes for performance
+        # Indexes for performance; plain timestamp lookups ride on the
+        # UNIQUE(timestamp) constraint's implicit index
         await conn.execute(
-            "CREATE INDEX idx_timestamp ON price_records(timestamp)"
+            """CREATE INDEX idx_price_lookup ON price_records (total_price ASC, timestamp ASC)
+               INCLUDE (spot_price, transport_taxes, median_price, category)"""
         )
         await conn.execute(
-            "CREATE INDEX idx_total_price ON price_records(total_price)"
+            "CREATE INDEX idx_timestamp_category ON price_records(timestamp, category)"
         )
         await conn.execute(
-            "CREATE INDEX idx_category ON price_records(category)"
+            "CREATE INDEX idx_timestamp_brin ON price_records USING BRIN (timestamp) WITH (pages_per_range = 16)"
         )
-        
+
         logger.info("Initial database schema created")
     
     async def _run_migrations(self, conn: asyncpg.Connection, from_version: int) -> None:
@@ -130,6 +248,21 @@ class DatabaseService:
         if from_version < 3:
             await self._migrate_to_v3(conn)
             await self._set_schema_version(conn, 3)
+        if from_version < 4:
+            await self._migrate_to_v4(conn)
+            await self._set_schema_version(conn, 4)
+        if from_version < 5:
+            await self._migrate_to_v5(conn)
+            await self._set_schema_version(conn, 5)
+        if from_version < 6:
+            await self._migrate_to_v6(conn)
+            await self._set_schema_version(conn, 6)
+        if from_version < 7:
+            await self._migrate_to_v7(conn)
+            await self._set_schema_version(conn, 7)
+        if from_version < 8:
+            await self._migrate_to_v8(conn)
+            await self._set_schema_version(conn, 8)
     
     async def _migrate_to_v2(self, conn: asyncpg.Connection) -> None:
         """Migrate to schema version 2: Add median_price column."""
@@ -202,70 +335,221 @@ class DatabaseService:
         
         logger.info("Migration to schema version 3 completed - negative prices now allowed")
     
+    async def _migrate_to_v4(self, conn: asyncpg.Connection) -> None:
+        """Migrate to schema version 4: Add composite (timestamp, category) index."""
+        logger.info("Running migration to schema version 4")
+
+        # Composite index so range scans that also filter or group on category
+        # stay within the index instead of fetching full rows
+        await conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_timestamp_category ON price_records(timestamp, category)"
+        )
+
+        # Refresh planner statistics so the new index actually gets picked
+        await conn.execute("ANALYZE price_records")
+
+        logger.info("Migration to schema version 4 completed")
+
+    async def _migrate_to_v5(self, conn: asyncpg.Connection) -> None:
+        """Migrate to schema version 5: Add BRIN index on timestamp."""
+        logger.info("Running migration to schema version 5")
+
+        # Price data is append-only in timestamp order, the best case for
+        # BRIN: block-range pruning on the hot range scans at a fraction of
+        # a btree's size and maintenance cost
+        await conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_timestamp_brin ON price_records USING BRIN (timestamp) WITH (pages_per_range = 16)"
+        )
+        await conn.execute("ANALYZE price_records")
+
+        logger.info("Migration to schema version 5 completed")
+
+    async def _migrate_to_v6(self, conn: asyncpg.Connection) -> None:
+        """Migrate to schema version 6: Covering index for cheapest-hour lookups."""
+        logger.info("Running migration to schema version 6")
+
+        # get_cheapest_hour orders by (total_price, timestamp) and selects
+        # every price column; with the non-key columns INCLUDEd, the whole
+        # query is answered by a bounded index-only scan with no heap fetches
+        await conn.execute(
+            """CREATE INDEX IF NOT EXISTS idx_price_lookup ON price_records (total_price ASC, timestamp ASC)
+               INCLUDE (spot_price, transport_taxes, median_price, category)"""
+        )
+
+        # The covering index is a strict superset of the old single-column one
+        await conn.execute("DROP INDEX IF EXISTS idx_total_price")
+        await conn.execute("ANALYZE price_records")
+
+        logger.info("Migration to schema version 6 completed")
+
+    async def _migrate_to_v7(self, conn: asyncpg.Connection) -> None:
+        """Migrate to schema version 7: Enforce NOT NULL on median_price."""
+        logger.info("Running migration to schema version 7")
+
+        # v2 backfilled every row, so this only has to flip the constraint;
+        # with it guaranteed, readers can drop their COALESCE fallbacks
+        await conn.execute(
+            "ALTER TABLE price_records ALTER COLUMN median_price SET NOT NULL"
+        )
+
+        logger.info("Migration to schema version 7 completed")
+
+    async def _migrate_to_v8(self, conn: asyncpg.Connection) -> None:
+        """Migrate to schema version 8: Drop indexes no query uses."""
+        logger.info("Running migration to schema version 8")
+
+        # No query filters on category alone, and idx_timestamp duplicates
+        # the btree the UNIQUE(timestamp) constraint already maintains;
+        # every upsert was paying to keep both current
+        await conn.execute("DROP INDEX IF EXISTS idx_category")
+        await conn.execute("DROP INDEX IF EXISTS idx_timestamp")
+
+        logger.info("Migration to schema version 8 completed")
+
     async def save_price_records(self, records: List[PriceRecord]) -> None:
         """Save price records to database with duplicate detection and price change logging."""
         if not records:
             return
-            
+
+        # Last record wins for a repeated timestamp: the Andel CSV carries
+        # naive Copenhagen wall-clock times, so the DST fall-back hour shows
+        # up twice, and a single-statement upsert cannot touch the same row
+        # twice ("ON CONFLICT DO UPDATE command cannot affect row a second
+        # time"). The old per-row executemany absorbed this silently.
+        records = list({record.timestamp: record for record in records}.values())
+
         try:
             pool = await self._get_pool()
-            async with pool.acquire() as conn:
-                price_changes = []
-                
-                # Check for existing records and detect price changes
-                for record in records:
-                    existing = await conn.fetchval(
-                        "SELECT total_price FROM price_records WHERE timestamp = $1",
-                        record.timestamp
+            async with pool.acquire() as conn, conn.transaction():
+                # Prices are re-fetchable from upstream, so skip the commit
+                # fsync wait; a crash can cost at most the current batch,
+                # which the next scheduled fetch restores
+                await conn.execute("SET LOCAL synchronous_commit = off")
+
+                if len(records) >= COPY_BATCH_THRESHOLD:
+                    # Bulk path: COPY the batch into a transaction-scoped
+                    # staging table (binary wire format, no per-row protocol
+                    # messages), then upsert from it in one statement
+                    await conn.execute("""
+                        CREATE TEMP TABLE price_records_stage (
+                            timestamp TIMESTAMP,
+                            spot_price DECIMAL(10,6),
+                            transport_taxes DECIMAL(10,6),
+                            total_price DECIMAL(10,6),
+                            median_price DECIMAL(10,6),
+                            category VARCHAR(10)
+                        ) ON COMMIT DROP
+                    """)
+                    # A generator feeds COPY row by row without materializing
+                    # a second list of the whole batch
+                    await conn.copy_records_to_table(
+                        'price_records_stage',
+                        records=(
+                            (
+                                record.timestamp,
+                                record.spot_price,
+                                record.transport_taxes,
+                                record.total_price,
+                                record.median_price,
+                                record.category.value,
+                            )
+                            for record in records
+                        ),
+                        columns=['timestamp', 'spot_price', 'transport_taxes',
+                                 'total_price', 'median_price', 'category']
                     )
-                    
-                    if existing and float(existing) != record.total_price:
-                        price_changes.append({
-                            'timestamp': record.timestamp,
-                            'old_price': float(existing),
-                            'new_price': record.total_price
-                        })
-                
-                # Log price changes
-                for change in price_changes:
-                    logger.info(
-                        "Price updated for timestamp",
-                        timestamp=change['timestamp'].strftime('%d.%m.%Y %H:%M'),
-                        old_price=f"{change['old_price']:.4f} DKK/kWh",
-                        new_price=f"{change['new_price']:.4f} DKK/kWh"
+                    # The stage table has no unique constraint, so guard the
+                    # upsert against duplicate timestamps sneaking in even if
+                    # the batch dedupe above ever changes
+                    source_sql = """
+                        SELECT DISTINCT ON (timestamp)
+                               timestamp, spot_price, transport_taxes, total_price, median_price, category
+                        FROM price_records_stage
+                        ORDER BY timestamp
+                    """
+                    args = []
+                else:
+                    # Regular path: ship the batch as six parallel arrays and
+                    # unnest them server-side, one statement for any size
+                    source_sql = """
+                        SELECT * FROM UNNEST(
+                            $1::timestamp[], $2::numeric[], $3::numeric[],
+                            $4::numeric[], $5::numeric[], $6::varchar[]
+                        ) AS v(timestamp, spot_price, transport_taxes, total_price, median_price, category)
+                    """
+                    # One pass over the batch instead of six comprehensions;
+                    # reading the model __dict__ once per record skips the
+                    # repeated pydantic attribute lookups
+                    timestamps, spots, transports, totals, medians, categories = [], [], [], [], [], []
+                    for record in records:
+                        fields = record.__dict__
+                        timestamps.append(fields['timestamp'])
+                        spots.append(fields['spot_price'])
+                        transports.append(fields['transport_taxes'])
+                        totals.append(fields['total_price'])
+                        medians.append(fields['median_price'])
+                        categories.append(fields['category'].value)
+                    args = [timestamps, spots, transports, totals, medians, categories]
+
+                # Change detection rides along with the upsert: the CTEs see
+                # the pre-insert snapshot, so `changes` reads the old prices
+                # without a separate lookup round-trip
+                price_changes = await conn.fetch(f"""
+                    WITH incoming AS ({source_sql}),
+                    changes AS (
+                        SELECT i.timestamp, p.total_price AS old_price, i.total_price AS new_price
+                        FROM incoming i
+                        JOIN price_records p USING (timestamp)
+                        WHERE p.total_price IS DISTINCT FROM i.total_price
+                    ),
+                    upsert AS (
+                        INSERT INTO price_records
+                        (timestamp, spot_price, transport_taxes, total_price, median_price, category)
+                        SELECT timestamp, spot_price, transport_taxes, total_price, median_price, category
+                        FROM incoming
+                        ON CONFLICT (timestamp) DO UPDATE SET
+                            spot_price = EXCLUDED.spot_price,
+                            transport_taxes = EXCLUDED.transport_taxes,
+                            total_price = EXCLUDED.total_price,
+                            median_price = EXCLUDED.median_price,
+                            category = EXCLUDED.category
+                        WHERE (price_records.spot_price, price_records.transport_taxes,
+                               price_records.total_price, price_records.median_price,
+                               price_records.category)
+                              IS DISTINCT FROM
+                              (EXCLUDED.spot_price, EXCLUDED.transport_taxes,
+                               EXCLUDED.total_price, EXCLUDED.median_price,
+                               EXCLUDED.category)
                     )
-                
-                # Prepare data for batch insert
-                records_data = [
-                    (
-                        record.timestamp,
-                        record.spot_price,
-                        record.transport_taxes,
-                        record.total_price,
-                        record.median_price,
-                        record.category.value,
+                    SELECT timestamp, old_price, new_price FROM changes
+                """, *args)
+
+                # One structured event for the whole changeset instead of a
+                # log-pipeline pass per changed row; isoformat() is C-level,
+                # unlike strftime's format-string interpreter
+                if price_changes:
+                    logger.info(
+                        "Prices updated",
+                        count=len(price_changes),
+                        currency="DKK/kWh",
+                        changes=[
+                            {
+                                'timestamp': change['timestamp'].isoformat(),
+                                'old_price': round(float(change['old_price']), 4),
+                                'new_price': round(float(change['new_price']), 4),
+                            }
+                            for change in price_changes
+                        ]
                     )
-                    for record in records
-                ]
-                
-                # Use ON CONFLICT to handle duplicates (PostgreSQL UPSERT)
-                await conn.executemany("""
-                    INSERT INTO price_records 
-                    (timestamp, spot_price, transport_taxes, total_price, median_price, category)
-                    VALUES ($1, $2, $3, $4, $5, $6)
-                    ON CONFLICT (timestamp) DO UPDATE SET
-                        spot_price = EXCLUDED.spot_price,
-                        transport_taxes = EXCLUDED.transport_taxes,
-                        total_price = EXCLUDED.total_price,
-                        median_price = EXCLUDED.median_price,
-                        category = EXCLUDED.category
-                """, records_data)
-                
+
                 logger.info(
-                    "Saved price records", 
+                    "Saved price records",
                     count=len(records),
                     price_changes=len(price_changes)
                 )
+
+            # Invalidate any caches keyed on the stored data
+            self._data_version += 1
                 
         except Exception as e:
             logger.error("Failed to save price records", error=str(e))
@@ -273,48 +557,51 @@ class DatabaseService:
     
     async def get_cheapest_hour(self, within_hours: Optional[int] = None) -> PriceRecord:
         """Find the cheapest hour within timeframe."""
+        records = await self.get_cheapest_hours(count=1, within_hours=within_hours)
+        return records[0]
+
+    async def get_cheapest_hours(self, count: int = 5, within_hours: Optional[int] = None) -> List[PriceRecord]:
+        """Find the cheapest hours within timeframe, cheapest first.
+
+        One round-trip regardless of count: Postgres walks the
+        (total_price, timestamp) covering index until count rows qualify,
+        so callers wanting fallback alternatives don't pay a query each.
+        """
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
                 # Use next complete hour to exclude partially completed hours
                 search_start_time = get_next_complete_hour()
-                
+
                 if within_hours is not None:
                     end_time = search_start_time + timedelta(hours=within_hours)
                     query = """
                         SELECT timestamp, spot_price, transport_taxes, total_price, median_price, category
-                        FROM price_records 
+                        FROM price_records
                         WHERE timestamp >= $1 AND timestamp <= $2
                         ORDER BY total_price ASC, timestamp ASC
-                        LIMIT 1
+                        LIMIT $3
                     """
-                    row = await conn.fetchrow(query, search_start_time, end_time)
+                    rows = await conn.fetch(query, search_start_time, end_time, count)
                 else:
                     query = """
                         SELECT timestamp, spot_price, transport_taxes, total_price, median_price, category
-                        FROM price_records 
+                        FROM price_records
                         WHERE timestamp >= $1
                         ORDER BY total_price ASC, timestamp ASC
-                        LIMIT 1
+                        LIMIT $2
                     """
-                    row = await conn.fetchrow(query, search_start_time)
-                
-                if not row:
+                    rows = await conn.fetch(query, search_start_time, count)
+
+                if not rows:
                     raise NoPriceDataError("No price data available for the specified timeframe")
-                
-                return PriceRecord(
-                    timestamp=row['timestamp'],
-                    spot_price=float(row['spot_price']),
-                    transport_taxes=float(row['transport_taxes']),
-                    total_price=float(row['total_price']),
-                    median_price=float(row['median_price']),
-                    category=PriceCategory(row['category']),
-                )
-                
+
+                return [self._row_to_record(row) for row in rows]
+
         except NoPriceDataError:
             raise
         except Exception as e:
-            logger.error("Failed to get cheapest hour", error=str(e))
+            logger.error("Failed to get cheapest hours", error=str(e))
             raise DatabaseError(f"Database query failed: {e}")
     
     async def get_cheapest_sequence_start(self, duration: int, within_hours: Optional[int] = None) -> PriceRecord:
@@ -337,52 +624,21 @@ class DatabaseService:
                 # 2. End time of sequence is within our search window
                 # 3. We have complete hourly data for the entire sequence
                 sequence_end_cutoff = search_end_time - timedelta(hours=duration-1)
-                
-                # PostgreSQL query using window functions for sequence analysis
-                query = f"""
-                    WITH hourly_prices AS (
-                        SELECT timestamp, spot_price, transport_taxes, total_price, median_price, category
-                        FROM price_records 
-                        WHERE timestamp >= $1 AND timestamp <= $2
-                        ORDER BY timestamp
-                    ),
-                    sequence_sums AS (
-                        SELECT h1.timestamp, h1.spot_price, h1.transport_taxes, h1.total_price, h1.median_price, h1.category,
-                               (
-                                   SELECT SUM(h2.total_price)
-                                   FROM hourly_prices h2
-                                   WHERE h2.timestamp >= h1.timestamp
-                                     AND h2.timestamp <= (h1.timestamp + INTERVAL '{duration-1} hours')
-                               ) as sequence_sum,
-                               (
-                                   SELECT COUNT(*)
-                                   FROM hourly_prices h3
-                                   WHERE h3.timestamp >= h1.timestamp
-                                     AND h3.timestamp <= (h1.timestamp + INTERVAL '{duration-1} hours')
-                               ) as sequence_count
-                        FROM hourly_prices h1
-                    )
-                    SELECT timestamp, spot_price, transport_taxes, total_price, median_price, category
-                    FROM sequence_sums
-                    WHERE sequence_count = $3
-                      AND sequence_sum IS NOT NULL
-                    ORDER BY sequence_sum ASC, timestamp ASC
-                    LIMIT 1
-                """
-                
+
+                # The interval length ends up in the SQL text (frame clauses
+                # cannot be bound as parameters), so pin it to a sane integer
+                duration = int(duration)
+                if not 1 <= duration <= 24:
+                    raise ValueError(f"Invalid sequence duration: {duration}")
+
+                query = _sequence_query(duration)
+
                 row = await conn.fetchrow(query, search_start_time, sequence_end_cutoff, duration)
                 
                 if not row:
                     raise NoSequenceFoundError(f"No suitable {duration}-hour sequence found")
-                
-                return PriceRecord(
-                    timestamp=row['timestamp'],
-                    spot_price=float(row['spot_price']),
-                    transport_taxes=float(row['transport_taxes']),
-                    total_price=float(row['total_price']),
-                    median_price=float(row['median_price']),
-                    category=PriceCategory(row['category']),
-                )
+
+                return self._row_to_record(row)
                 
         except NoSequenceFoundError:
             raise
@@ -391,25 +647,46 @@ class DatabaseService:
             raise DatabaseError(f"Database query failed: {e}")
     
     async def cleanup_old_records(self, retention_days: int) -> int:
-        """Remove old price records."""
+        """Remove old price records.
+
+        Deletes in bounded chunks so retention never holds row locks or
+        builds WAL for the whole backlog in one transaction; each chunk
+        commits on its own and yields to the event loop between rounds.
+        """
         try:
-            cutoff_date = datetime.now() - timedelta(days=retention_days)
-            
             pool = await self._get_pool()
+            total_deleted = 0
             async with pool.acquire() as conn:
-                result = await conn.execute(
-                    "DELETE FROM price_records WHERE timestamp < $1",
-                    cutoff_date
-                )
-                
-                # Extract number from result string like "DELETE 42"
-                deleted_count = int(result.split()[-1]) if result.split()[-1].isdigit() else 0
-                
-                if deleted_count > 0:
-                    logger.info("Cleaned up old records", deleted_count=deleted_count)
-                
-                return deleted_count
-                
+                # The cutoff is evaluated on the database clock, so retention
+                # is immune to app/server clock skew
+                while True:
+                    async with conn.transaction():
+                        # Expired rows are gone either way; don't make the
+                        # cleanup job wait on WAL fsync per chunk
+                        await conn.execute("SET LOCAL synchronous_commit = off")
+                        deleted = await conn.fetchval("""
+                            WITH removed AS (
+                                DELETE FROM price_records
+                                WHERE ctid IN (
+                                    SELECT ctid FROM price_records
+                                    WHERE timestamp < NOW()::timestamp - make_interval(days => $1)
+                                    LIMIT $2
+                                )
+                                RETURNING 1
+                            )
+                            SELECT COUNT(*) FROM removed
+                        """, retention_days, CLEANUP_DELETE_CHUNK)
+
+                    total_deleted += deleted
+                    if deleted < CLEANUP_DELETE_CHUNK:
+                        break
+                    await asyncio.sleep(0)
+
+            if total_deleted > 0:
+                logger.info("Cleaned up old records", deleted_count=total_deleted)
+
+            return total_deleted
+
         except Exception as e:
             logger.error("Failed to cleanup old records", error=str(e))
             raise DatabaseError(f"Cleanup failed: {e}")
@@ -417,34 +694,168 @@ class DatabaseService:
     async def get_recent_records(self, hours: int = 48) -> List[PriceRecord]:
         """Get recent price records for monitoring."""
         try:
-            start_time = datetime.now() - timedelta(hours=hours)
-            
             pool = await self._get_pool()
             async with pool.acquire() as conn:
+                # Window start comes from the database clock, avoiding
+                # app/server skew and one parameter conversion
                 rows = await conn.fetch("""
                     SELECT timestamp, spot_price, transport_taxes, total_price, 
-                           COALESCE(median_price, total_price) as median_price, category
+                           median_price, category
                     FROM price_records 
-                    WHERE timestamp >= $1
+                    WHERE timestamp >= NOW()::timestamp - make_interval(hours => $1)
                     ORDER BY timestamp ASC
-                """, start_time)
-                
-                return [
-                    PriceRecord(
-                        timestamp=row['timestamp'],
-                        spot_price=float(row['spot_price']),
-                        transport_taxes=float(row['transport_taxes']),
-                        total_price=float(row['total_price']),
-                        median_price=float(row['median_price']),
-                        category=PriceCategory(row['category']),
-                    )
-                    for row in rows
-                ]
+                """, hours)
+
+                return [self._row_to_record(row) for row in rows]
                 
         except Exception as e:
             logger.error("Failed to get recent records", error=str(e))
             raise DatabaseError(f"Query failed: {e}")
+
+    async def get_recent_records_columnar(self, hours: int = 48) -> dict:
+        """Get recent price data as column arrays for vectorized analysis.
+
+        Structure-of-arrays alternative to get_recent_records: one numpy
+        array per column instead of one PriceRecord per row, so consumers
+        computing medians or tertiles over the window run C loops on
+        contiguous memory. Categories come back as int8 codes in
+        PriceCategory declaration order.
+        """
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    SELECT timestamp, spot_price, transport_taxes, total_price, 
+                           median_price, category
+                    FROM price_records 
+                    WHERE timestamp >= NOW()::timestamp - make_interval(hours => $1)
+                    ORDER BY timestamp ASC
+                """, hours)
+
+                count = len(rows)
+                return {
+                    'timestamps': np.array([row['timestamp'] for row in rows], dtype='datetime64[s]'),
+                    'spot_price': np.fromiter((float(row['spot_price']) for row in rows), dtype=np.float64, count=count),
+                    'transport_taxes': np.fromiter((float(row['transport_taxes']) for row in rows), dtype=np.float64, count=count),
+                    'total_price': np.fromiter((float(row['total_price']) for row in rows), dtype=np.float64, count=count),
+                    'median_price': np.fromiter((float(row['median_price']) for row in rows), dtype=np.float64, count=count),
+                    'category_codes': np.fromiter((_CATEGORY_CODE_BY_VALUE[row['category']] for row in rows), dtype=np.int8, count=count),
+                }
+
+        except Exception as e:
+            logger.error("Failed to get recent records columnar", error=str(e))
+            raise DatabaseError(f"Query failed: {e}")
     
+    async def get_price_stats(self) -> dict:
+        """Get summary statistics for stored price data.
+
+        All scalar aggregates are combined into one query and the per-category
+        breakdown into a second, keeping the whole report at two round-trips.
+        """
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                summary = await conn.fetchrow("""
+                    SELECT COUNT(*) AS total_records,
+                           MIN(timestamp) AS first_timestamp,
+                           MAX(timestamp) AS last_timestamp,
+                           MIN(total_price) AS min_price,
+                           MAX(total_price) AS max_price,
+                           AVG(total_price) AS avg_price,
+                           SUM(CASE WHEN timestamp >= NOW()::timestamp - INTERVAL '24 hours' THEN 1 ELSE 0 END) AS last_24h_records
+                    FROM price_records
+                """)
+
+                categories = await conn.fetch("""
+                    SELECT category, COUNT(*) AS count
+                    FROM price_records
+                    GROUP BY category
+                    ORDER BY category
+                """)
+
+                return {
+                    'total_records': summary['total_records'],
+                    'first_timestamp': summary['first_timestamp'],
+                    'last_timestamp': summary['last_timestamp'],
+                    'min_price': float(summary['min_price']) if summary['min_price'] is not None else None,
+                    'max_price': float(summary['max_price']) if summary['max_price'] is not None else None,
+                    'avg_price': float(summary['avg_price']) if summary['avg_price'] is not None else None,
+                    'last_24h_records': summary['last_24h_records'],
+                    'categories': {row['category']: row['count'] for row in categories},
+                }
+
+        except Exception as e:
+            logger.error("Failed to get price stats", error=str(e))
+            raise DatabaseError(f"Stats query failed: {e}")
+
+    async def find_missing_hours(self, start_time: datetime, end_time: datetime) -> List[datetime]:
+        """Find hourly timestamps with no price record in the given range.
+
+        Pulls all stored timestamps with a single range query and diffs them
+        in-process against the expected hourly grid, instead of probing the
+        database once per hour.
+        """
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(
+                    "SELECT timestamp FROM price_records WHERE timestamp >= $1 AND timestamp <= $2 ORDER BY timestamp",
+                    start_time, end_time
+                )
+
+                # Sorted list + bisect instead of a set: contiguous memory and
+                # sequential scans, which matters once the range spans years
+                present = [row['timestamp'] for row in rows]
+
+                total_hours = int((end_time - start_time).total_seconds() // 3600)
+
+                missing = []
+                for h in range(total_hours + 1):
+                    expected = start_time + timedelta(hours=h)
+                    i = bisect_left(present, expected)
+                    if i == len(present) or present[i] != expected:
+                        missing.append(expected)
+
+                return missing
+
+        except Exception as e:
+            logger.error("Failed to find missing hours", error=str(e))
+            raise DatabaseError(f"Gap check failed: {e}")
+
+    async def get_health_stats(self) -> dict:
+        """Get data-freshness info for the health endpoint in one query.
+
+        The age and fresh/acceptable/stale classification are computed
+        server-side so the endpoint gets three ready scalars instead of
+        doing timestamp arithmetic per probe.
+        """
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                row = await conn.fetchrow("""
+                    SELECT MAX(created_at) AS last_fetch,
+                           ROUND(EXTRACT(EPOCH FROM (NOW()::timestamp - MAX(created_at))) / 3600.0, 1) AS data_age_hours,
+                           CASE
+                               WHEN MAX(created_at) IS NULL THEN 'unknown'
+                               WHEN NOW()::timestamp - MAX(created_at) <= INTERVAL '3 hours' THEN 'fresh'
+                               WHEN NOW()::timestamp - MAX(created_at) <= INTERVAL '25 hours' THEN 'acceptable'
+                               ELSE 'stale'
+                           END AS data_status
+                    FROM price_records
+                """)
+
+                return {
+                    'last_fetch': row['last_fetch'],
+                    'data_age_hours': float(row['data_age_hours']) if row['data_age_hours'] is not None else None,
+                    'data_status': row['data_status'],
+                }
+
+        except Exception as e:
+            # Degrade gracefully like get_latest_record_timestamp: a broken
+            # database shows up as unknown freshness, not an unhealthy service
+            logger.error("Failed to get health stats", error=str(e))
+            return {'last_fetch': None, 'data_age_hours': None, 'data_status': 'unknown'}
+
     async def get_latest_record_timestamp(self) -> Optional[datetime]:
         """Get the timestamp of the most recently created price record."""
         try:
@@ -464,12 +875,14 @@ class DatabaseService:
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
-                # Simple connectivity and table existence check
+                # Simple connectivity and table existence check; to_regclass
+                # hits the catalog cache instead of scanning the
+                # information_schema view per probe
                 result = await conn.fetchval(
-                    "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = 'price_records'"
+                    "SELECT to_regclass('price_records') IS NOT NULL"
                 )
-                
-                if result != 1:
+
+                if not result:
                     logger.error("Price records table not found")
                     return False
                 
@@ -7,8 +7,18 @@ import asyncio
 import sys
 from contextlib import asynccontextmanager
 
+import orjson
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
+
+try:
+    # Optional but ships with uvicorn[standard]: libuv-based event loop with
+    # noticeably lower dispatch overhead on the I/O-bound handlers
+    import uvloop
+    uvloop.install()
+except ImportError:  # pragma: no cover
+    uvloop = None
 
 from src.api.routes import router as api_router
 from src.config import settings
@@ -45,11 +55,27 @@ def create_app() -> FastAPI:
         docs_url="/docs" if settings.api_debug else None,
         redoc_url="/redoc" if settings.api_debug else None,
         lifespan=lifespan,
+        # orjson serializes datetimes natively in C, halving the JSON cost
+        # of the timestamp-heavy responses
+        default_response_class=ORJSONResponse,
     )
 
     # Include API routes
     app.include_router(api_router, prefix="/api/v1")
 
+    # The router is static, so build and encode the OpenAPI document once at
+    # startup instead of re-serializing it on every /openapi.json poll
+    openapi_payload = orjson.dumps(app.openapi())
+
+    async def _openapi_static(request):
+        return Response(content=openapi_payload, media_type="application/json")
+
+    app.router.routes[:] = [
+        route for route in app.router.routes
+        if getattr(route, "path", None) != app.openapi_url
+    ]
+    app.add_route(app.openapi_url, _openapi_static, include_in_schema=False)
+
     return app
 
 
@@ -6,6 +6,7 @@ Less complex, more predictable for small applications.
 import asyncio
 from datetime import datetime, time, timedelta
 from typing import Optional
+from zoneinfo import ZoneInfo
 
 from src.config import settings
 from src.logging_config import get_logger
@@ -13,6 +14,10 @@ from src.services.price_service import price_service
 
 logger = get_logger(__name__)
 
+# The configured fetch time is wall-clock time in this zone; scheduling with
+# aware datetimes keeps the 14:10 run correct across DST transitions
+FETCH_TZ = ZoneInfo(settings.fetch_timezone)
+
 
 class SimpleScheduler:
     """Simple background task scheduler for price fetching."""
@@ -52,7 +57,7 @@ class SimpleScheduler:
             try:
                 # Calculate next run time
                 next_run = self._calculate_next_run()
-                sleep_seconds = (next_run - datetime.now()).total_seconds()
+                sleep_seconds = (next_run - datetime.now(FETCH_TZ)).total_seconds()
                 
                 if sleep_seconds > 0:
                     logger.debug("Next price fetch scheduled", next_run=next_run.isoformat(), sleep_seconds=sleep_seconds)
@@ -75,8 +80,8 @@ class SimpleScheduler:
                 await asyncio.sleep(300)  # 5 minutes
     
     def _calculate_next_run(self) -> datetime:
-        """Calculate the next scheduled run time."""
-        now = datetime.now()
+        """Calculate the next scheduled run time in the configured fetch timezone."""
+        now = datetime.now(FETCH_TZ)
         today_run = now.replace(
             hour=settings.fetch_hour,
             minute=settings.fetch_minute,
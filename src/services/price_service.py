@@ -3,8 +3,10 @@ Unified price service - handles data fetching and optimization.
 Combines the previous data fetcher, optimizer, and repository into one service.
 """
 
+import asyncio
 from datetime import datetime, timedelta
 from decimal import Decimal
+from functools import lru_cache
 from io import StringIO
 import statistics
 from typing import List, Optional, Tuple
@@ -18,10 +20,15 @@ from src.database.service import db_service
 from src.exceptions import DataFetchError, NoPriceDataError, NoSequenceFoundError
 from src.logging_config import get_logger
 from src.models.price import OptimalTimeResponse, PriceCategory, PriceRecord
-from src.utils.time_utils import calculate_time_until
+from src.utils.time_utils import calculate_time_until, get_next_complete_hour
 
 logger = get_logger(__name__)
 
+# Timestamp layout of the Andel CSV 'Start' field, e.g. '07.08.2025 - 23:00'.
+# _parse_danish_datetime is the scalar reference for this same layout; if one
+# changes, the other must follow.
+DANISH_DATETIME_FORMAT = '%d.%m.%Y - %H:%M'
+
 
 def _calculate_percentile(sorted_values: List[Decimal], percentile: float) -> Decimal:
     """
@@ -92,22 +99,72 @@ def _calculate_tertile_boundaries(prices: List[Decimal]) -> Tuple[Decimal, Decim
     return tertile_low, tertile_high
 
 
+@lru_cache(maxsize=512)
+def _build_csv_url_cached(base_url: str, target_date: datetime) -> str:
+    """Build the Andel Energi CSV export URL for a 48-hour window.
+
+    Memoized: the inputs are fixed per (base_url, date), so backfill loops and
+    tests hitting the same date skip the string formatting and URL quoting.
+    """
+    start_date = datetime.combine(target_date, datetime.min.time())
+    # End date should be day after tomorrow to include tomorrow's 23:00 hour
+    end_date = start_date + timedelta(days=2)
+
+    params = {
+        'obexport_format': 'csv',
+        'obexport_start': start_date.strftime('%Y-%m-%d'),
+        'obexport_end': end_date.strftime('%Y-%m-%d'),
+        'obexport_region': settings.andel_energi_region,
+        'obexport_tax': settings.andel_energi_tax,
+        'obexport_product_id': settings.andel_energi_product_id,
+    }
+
+    logger.debug("Built CSV URL",
+                start_date=start_date.strftime('%Y-%m-%d'),
+                end_date=end_date.strftime('%Y-%m-%d'),
+                url_params=params)
+
+    return f"{base_url}?{urlencode(params)}"
+
+
 class PriceService:
     """Unified service for price data fetching, storage, and optimization."""
     
+    # Bound the memo cache; keys rotate hourly so stale entries never pile up far
+    _OPTIMUM_CACHE_MAX_ENTRIES = 128
+
     def __init__(self):
         self.base_url = settings.andel_energi_base_url
         self.timeout = 30
+        # Memoizes cheapest-hour/sequence lookups. Results only change when
+        # new data is stored or the search window rolls to the next hour, so
+        # the key is (query params, hour bucket, data version). The cached
+        # value is the PriceRecord, not the response: time_until still counts
+        # down per request.
+        self._optimum_cache: dict = {}
+
+    async def _cached_optimum(self, key: tuple, fetch) -> PriceRecord:
+        """Return a cached optimization result, computing it on first use."""
+        cached = self._optimum_cache.get(key)
+        if cached is not None:
+            return cached
+
+        record = await fetch()
+
+        if len(self._optimum_cache) >= self._OPTIMUM_CACHE_MAX_ENTRIES:
+            self._optimum_cache.clear()
+        self._optimum_cache[key] = record
+        return record
     
-    async def fetch_and_store_daily_prices(self, target_date: datetime = None) -> int:
+    async def fetch_and_store_daily_prices(self, target_date: datetime = None, client: Optional[httpx.AsyncClient] = None) -> int:
         """Fetch 48-hour prices from Andel Energi (today + tomorrow) and store them."""
         if target_date is None:
             target_date = datetime.now().date()
-        
+
         try:
             # Build URL and fetch data (today + tomorrow)
             url = self._build_csv_url(target_date)
-            csv_content = await self._fetch_csv_data(url)
+            csv_content = await self._fetch_csv_data(url, client=client)
             
             # Parse and store with 48h median calculation
             records = self._parse_danish_csv(csv_content)
@@ -123,9 +180,40 @@ class PriceService:
             logger.error("Failed to fetch daily prices", error=str(e), date=target_date.isoformat() if target_date else None)
             raise DataFetchError(f"Failed to fetch prices: {e}")
     
+    async def fetch_range(self, start_date: datetime, end_date: datetime, concurrency: int = 4) -> int:
+        """Fetch and store prices for a date range with overlapped requests.
+
+        Backfills issue one fetch per day; running them sequentially costs one
+        round-trip per day. Requests share a single keep-alive client and run
+        concurrently under a semaphore so the upstream API is not hammered.
+        """
+        dates = []
+        current = start_date
+        while current <= end_date:
+            dates.append(current)
+            current = current + timedelta(days=1)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_one(date: datetime, client: httpx.AsyncClient) -> int:
+            async with semaphore:
+                return await self.fetch_and_store_daily_prices(date, client=client)
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            counts = await asyncio.gather(*[fetch_one(date, client) for date in dates])
+
+        total = sum(counts)
+        logger.info("Fetched price range",
+                   start_date=start_date.isoformat(),
+                   end_date=end_date.isoformat(),
+                   days=len(dates),
+                   count=total)
+        return total
+
     async def get_cheapest_hour(self, within_hours: Optional[int] = None, format_type: str = "hours") -> OptimalTimeResponse:
         """Find the cheapest hour."""
-        record = await db_service.get_cheapest_hour(within_hours)
+        key = ('hour', within_hours, get_next_complete_hour(), db_service.data_version)
+        record = await self._cached_optimum(key, lambda: db_service.get_cheapest_hour(within_hours))
         time_until = calculate_time_until(record.timestamp, format_type)
         logger.debug("Found cheapest hour", start_time=record.timestamp.isoformat(), price=record.total_price)
         return OptimalTimeResponse(start_time=record.timestamp, time_until=time_until)
@@ -135,7 +223,10 @@ class PriceService:
         if duration <= 0:
             raise ValueError("Duration must be positive")
         
-        record = await db_service.get_cheapest_sequence_start(duration, within_hours)
+        key = ('sequence', duration, within_hours, get_next_complete_hour(), db_service.data_version)
+        record = await self._cached_optimum(
+            key, lambda: db_service.get_cheapest_sequence_start(duration, within_hours)
+        )
         time_until = calculate_time_until(record.timestamp, format_type)
         logger.debug("Found cheapest sequence", start_time=record.timestamp.isoformat(), duration=duration)
         return OptimalTimeResponse(start_time=record.timestamp, time_until=time_until)
@@ -146,37 +237,31 @@ class PriceService:
     
     def _build_csv_url(self, target_date: datetime) -> str:
         """Build Andel Energi CSV URL for 48 hours (today + tomorrow)."""
-        start_date = datetime.combine(target_date, datetime.min.time())
-        # End date should be day after tomorrow to include tomorrow's 23:00 hour
-        end_date = start_date + timedelta(days=2)
-        
-        params = {
-            'obexport_format': 'csv',
-            'obexport_start': start_date.strftime('%Y-%m-%d'),
-            'obexport_end': end_date.strftime('%Y-%m-%d'),
-            'obexport_region': settings.andel_energi_region,
-            'obexport_tax': settings.andel_energi_tax,
-            'obexport_product_id': settings.andel_energi_product_id,
-        }
-        
-        logger.debug("Built CSV URL", 
-                    start_date=start_date.strftime('%Y-%m-%d'),
-                    end_date=end_date.strftime('%Y-%m-%d'),
-                    url_params=params)
-        
-        return f"{self.base_url}?{urlencode(params)}"
+        return _build_csv_url_cached(self.base_url, target_date)
     
-    async def _fetch_csv_data(self, url: str) -> str:
-        """Download CSV data."""
+    async def _fetch_csv_data(self, url: str, client: Optional[httpx.AsyncClient] = None) -> str:
+        """Download CSV data, optionally reusing a shared client."""
         try:
+            if client is not None:
+                return await self._stream_csv(client, url)
+
             async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                return response.text
+                return await self._stream_csv(client, url)
         except httpx.HTTPError as e:
             raise DataFetchError(f"HTTP error: {e}")
         except Exception as e:
             raise DataFetchError(f"Unexpected error: {e}")
+
+    async def _stream_csv(self, client: httpx.AsyncClient, url: str) -> str:
+        """Stream the response body in decoded chunks.
+
+        Avoids response.text, which keeps both the raw bytes and the decoded
+        string alive on the Response object — the body is consumed once.
+        """
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            chunks = [chunk async for chunk in response.aiter_text()]
+        return ''.join(chunks)
     
     def _parse_danish_csv(self, csv_content: str) -> List[PriceRecord]:
         """Parse Danish CSV format into PriceRecord objects."""
@@ -184,34 +269,39 @@ class PriceService:
             df = pd.read_csv(
                 StringIO(csv_content),
                 sep=',',
-                decimal=',',
+                dtype=str,
                 parse_dates=False,
             )
-            
+
             expected_columns = ['Start', 'Elpris', 'Transport og afgifter', 'Total']
             if not all(col in df.columns for col in expected_columns):
                 missing = set(expected_columns) - set(df.columns)
                 raise ValueError(f"Missing CSV columns: {missing}")
-            
-            records = []
-            prices_for_categorization = []
-            
-            # First pass: parse basic data using Decimal for currency precision
-            temp_records = []
-            for _, row in df.iterrows():
-                timestamp = self._parse_danish_datetime(row['Start'].strip())
-                # Parse Danish decimal format and convert to Decimal for exact currency arithmetic
-                spot_price = Decimal(str(row['Elpris']).replace(',', '.'))
-                transport_taxes = Decimal(str(row['Transport og afgifter']).replace(',', '.'))
-                total_price = Decimal(str(row['Total']).replace(',', '.'))
-                
-                temp_records.append({
+
+            # Vectorized parsing: convert each column in bulk instead of per-row loops.
+            # to_pydatetime() is called per Timestamp because the Series-level
+            # .dt accessor version is deprecated (FutureWarning, return type
+            # changes in pandas 3)
+            timestamps = [
+                parsed.to_pydatetime()
+                for parsed in pd.to_datetime(df['Start'].str.strip(), format=DANISH_DATETIME_FORMAT)
+            ]
+
+            # Parse Danish decimal format column-wise, keeping Decimal for exact currency arithmetic
+            spot_prices = [Decimal(v) for v in df['Elpris'].str.replace(',', '.', regex=False)]
+            transport_taxes = [Decimal(v) for v in df['Transport og afgifter'].str.replace(',', '.', regex=False)]
+            total_prices = [Decimal(v) for v in df['Total'].str.replace(',', '.', regex=False)]
+
+            temp_records = [
+                {
                     'timestamp': timestamp,
-                    'spot_price': spot_price,
-                    'transport_taxes': transport_taxes,
-                    'total_price': total_price
-                })
-                prices_for_categorization.append(total_price)
+                    'spot_price': spot,
+                    'transport_taxes': taxes,
+                    'total_price': total,
+                }
+                for timestamp, spot, taxes, total in zip(timestamps, spot_prices, transport_taxes, total_prices)
+            ]
+            prices_for_categorization = total_prices
             
             # Calculate 48-hour median and tertile thresholds using Decimal
             median_price = Decimal('0.0')
@@ -274,7 +364,12 @@ class PriceService:
             raise DataFetchError(f"CSV parsing failed: {e}")
     
     def _parse_danish_datetime(self, datetime_str: str) -> datetime:
-        """Parse Danish datetime: '07.08.2025 - 23:00'"""
+        """Parse Danish datetime: '07.08.2025 - 23:00'
+
+        Scalar reference implementation of DANISH_DATETIME_FORMAT. The bulk
+        CSV path parses via pandas; this stays as the single-value parser
+        (and its test anchor) so the two layouts cannot drift apart silently.
+        """
         try:
             date_part, time_part = datetime_str.split(' - ')
             day, month, year = date_part.split('.')
@@ -7,6 +7,10 @@ from datetime import datetime, timedelta
 from typing import Union
 import pytz
 
+# Cached at module scope: pytz.timezone() re-reads tz data on every call,
+# and these helpers run on the request hot path.
+COPENHAGEN_TZ = pytz.timezone('Europe/Copenhagen')
+
 
 def calculate_time_until(start_time: datetime, format_type: str = "hours") -> Union[str, int]:
     """
@@ -22,17 +26,14 @@ def calculate_time_until(start_time: datetime, format_type: str = "hours") -> Un
     Raises:
         ValueError: If start_time is in the past or format_type is invalid
     """
-    # Copenhagen timezone
-    copenhagen_tz = pytz.timezone('Europe/Copenhagen')
-    
     # Get current time in Copenhagen
-    now_copenhagen = datetime.now(copenhagen_tz)
+    now_copenhagen = datetime.now(COPENHAGEN_TZ)
     
     # Make start_time timezone-aware (assume it's in Copenhagen time)
     if start_time.tzinfo is None:
-        start_time_copenhagen = copenhagen_tz.localize(start_time)
+        start_time_copenhagen = COPENHAGEN_TZ.localize(start_time)
     else:
-        start_time_copenhagen = start_time.astimezone(copenhagen_tz)
+        start_time_copenhagen = start_time.astimezone(COPENHAGEN_TZ)
     
     # Calculate the difference
     time_diff = start_time_copenhagen - now_copenhagen
@@ -77,18 +78,16 @@ def get_next_complete_hour(reference_time: datetime = None) -> datetime:
         - 12:05 -> 13:00 (round up to next hour)
         - 12:59 -> 13:00 (round up to next hour)
     """
-    copenhagen_tz = pytz.timezone('Europe/Copenhagen')
-    
     if reference_time is None:
         # Get current time in Copenhagen timezone
-        copenhagen_now = datetime.now(copenhagen_tz)
+        copenhagen_now = datetime.now(COPENHAGEN_TZ)
     else:
         # Convert reference time to Copenhagen timezone if it has timezone info
         if reference_time.tzinfo is None:
             # Assume it's already Copenhagen time if timezone-naive
-            copenhagen_now = copenhagen_tz.localize(reference_time)
+            copenhagen_now = COPENHAGEN_TZ.localize(reference_time)
         else:
-            copenhagen_now = reference_time.astimezone(copenhagen_tz)
+            copenhagen_now = reference_time.astimezone(COPENHAGEN_TZ)
     
     # Always round up to the next hour
     next_hour = copenhagen_now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
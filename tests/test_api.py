@@ -72,6 +72,36 @@ class TestCheapestHourEndpoint:
         data = response.json()
         assert "No data available" in data["detail"]
     
+    @patch("src.api.routes.price_service")
+    def test_cheapest_hour_cache_headers(self, mock_price_service, test_client):
+        """Test that successful responses carry ETag and Cache-Control headers."""
+        mock_price_service.get_cheapest_hour = AsyncMock(return_value=OptimalTimeResponse(
+            start_time=datetime(2025, 8, 7, 14, 0, 0),
+            time_until="03:30"
+        ))
+        
+        response = test_client.get("/api/v1/cheapest-hour")
+        
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "public, max-age=60"
+        assert response.headers["etag"].startswith('"')
+    
+    @patch("src.api.routes.price_service")
+    def test_cheapest_hour_if_none_match_returns_304(self, mock_price_service, test_client):
+        """Test that a matching If-None-Match yields a 304 with the ETag."""
+        mock_price_service.get_cheapest_hour = AsyncMock(return_value=OptimalTimeResponse(
+            start_time=datetime(2025, 8, 7, 14, 0, 0),
+            time_until="03:30"
+        ))
+        
+        etag = test_client.get("/api/v1/cheapest-hour").headers["etag"]
+        response = test_client.get("/api/v1/cheapest-hour", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == "public, max-age=60"
+    
     def test_cheapest_hour_invalid_within_hours(self, test_client):
         """Test cheapest hour with invalid within_hours parameter."""
         # Test negative value
@@ -127,6 +157,27 @@ class TestCheapestSequenceStartEndpoint:
         data = response.json()
         assert "No suitable sequence found" in data["detail"]
     
+    @patch("src.api.routes.price_service")
+    def test_cheapest_sequence_if_none_match_returns_304(self, mock_price_service, test_client):
+        """Test ETag revalidation on the sequence endpoint."""
+        mock_price_service.get_cheapest_sequence_start = AsyncMock(return_value=OptimalTimeResponse(
+            start_time=datetime(2025, 8, 7, 23, 0, 0),
+            time_until="09:00"
+        ))
+        
+        first = test_client.get("/api/v1/cheapest-sequence-start?duration=3")
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "public, max-age=60"
+        
+        response = test_client.get(
+            "/api/v1/cheapest-sequence-start?duration=3",
+            headers={"If-None-Match": etag}
+        )
+        
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    
     def test_cheapest_sequence_missing_duration(self, test_client):
         """Test cheapest sequence request without required duration parameter."""
         response = test_client.get("/api/v1/cheapest-sequence-start")
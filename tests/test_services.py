@@ -4,10 +4,11 @@ Tests the simplified price service and database service.
 """
 
 from datetime import datetime
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from src.database.service import DatabaseService
 from src.exceptions import NoPriceDataError, NoSequenceFoundError, DataFetchError
 from src.models.price import OptimalTimeResponse, PriceCategory, PriceRecord
 from src.services.price_service import PriceService
@@ -73,26 +74,32 @@ class TestPriceService:
     
     @pytest.mark.asyncio
     async def test_fetch_csv_data_success(self, price_service):
-        """Test successful CSV data fetching."""
+        """Test successful CSV data fetching via the streaming path."""
         mock_csv_content = "Start,Elpris,Transport og afgifter,Total\n"
-        
+
+        async def mock_aiter_text():
+            yield mock_csv_content
+
         with patch('httpx.AsyncClient') as mock_client:
-            mock_response = AsyncMock()
+            mock_response = MagicMock()
             mock_response.status_code = 200
-            mock_response.text = mock_csv_content
             mock_response.raise_for_status.return_value = None
-            
-            mock_client.return_value.__aenter__.return_value.get.return_value = mock_response
-            
+            mock_response.aiter_text.return_value = mock_aiter_text()
+
+            mock_stream = MagicMock()
+            mock_stream.__aenter__ = AsyncMock(return_value=mock_response)
+            mock_stream.__aexit__ = AsyncMock(return_value=None)
+            mock_client.return_value.__aenter__.return_value.stream = MagicMock(return_value=mock_stream)
+
             result = await price_service._fetch_csv_data("http://example.com/test.csv")
             assert result == mock_csv_content
-    
+
     @pytest.mark.asyncio
     async def test_fetch_csv_data_http_error(self, price_service):
         """Test CSV data fetching with HTTP error."""
         with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.get.side_effect = Exception("Network error")
-            
+            mock_client.return_value.__aenter__.return_value.stream = MagicMock(side_effect=Exception("Network error"))
+
             with pytest.raises(DataFetchError, match="Unexpected error"):
                 await price_service._fetch_csv_data("http://example.com/test.csv")
     
@@ -142,3 +149,64 @@ class TestPriceService:
         
         with pytest.raises(ValueError, match="Duration must be positive"):
             await price_service.get_cheapest_sequence_start(duration=-1)
+
+
+class TestDatabaseService:
+    """Tests for the DatabaseService write path."""
+
+    @pytest.mark.asyncio
+    async def test_save_price_records_dedupes_timestamps(self):
+        """Test that a batch with a repeated timestamp keeps only the last record.
+
+        The Andel CSV repeats the 02:00 hour on the DST fall-back night; the
+        single-statement upsert would fail with a cardinality violation if
+        both rows reached the INSERT, so the batch must collapse last-wins.
+        """
+        service = DatabaseService(database_url="postgresql://test")
+
+        mock_conn = MagicMock()
+        mock_conn.execute = AsyncMock()
+        mock_conn.fetch = AsyncMock(return_value=[])
+
+        mock_transaction = MagicMock()
+        mock_transaction.__aenter__ = AsyncMock(return_value=None)
+        mock_transaction.__aexit__ = AsyncMock(return_value=None)
+        mock_conn.transaction = MagicMock(return_value=mock_transaction)
+
+        mock_acquire = MagicMock()
+        mock_acquire.__aenter__ = AsyncMock(return_value=mock_conn)
+        mock_acquire.__aexit__ = AsyncMock(return_value=None)
+
+        mock_pool = MagicMock()
+        mock_pool.acquire = MagicMock(return_value=mock_acquire)
+
+        duplicated_hour = datetime(2025, 10, 26, 2, 0, 0)
+        records = [
+            PriceRecord(
+                timestamp=duplicated_hour,
+                spot_price=1.0,
+                transport_taxes=1.25,
+                total_price=2.25,
+                median_price=2.50,
+                category=PriceCategory.OKAY
+            ),
+            PriceRecord(
+                timestamp=duplicated_hour,
+                spot_price=1.5,
+                transport_taxes=1.25,
+                total_price=2.75,
+                median_price=2.50,
+                category=PriceCategory.AVOID
+            ),
+        ]
+
+        with patch.object(DatabaseService, '_get_pool', new=AsyncMock(return_value=mock_pool)):
+            await service.save_price_records(records)
+
+        # The upsert statement receives six parallel arrays after the SQL text
+        timestamps, spots, transports, totals, medians, categories = mock_conn.fetch.call_args.args[1:7]
+
+        assert timestamps == [duplicated_hour]
+        assert spots == [records[1].spot_price]
+        assert totals == [records[1].total_price]
+        assert categories == [PriceCategory.AVOID.value]